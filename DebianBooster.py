@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-import os, pwd, shutil, signal, subprocess, sys, time
+import fnmatch, json, os, pwd, re, shlex, shutil, signal, stat, statistics, subprocess, sys, tempfile, time
+STARTUP_T0 = time.perf_counter()
 from pathlib import Path
 from functools import partial
 from PyQt5 import QtCore, QtWidgets
@@ -8,12 +9,30 @@ from PyQt5.QtWidgets import QProgressDialog
 
 HOME = Path(pwd.getpwnam(os.environ["SUDO_USER"]).pw_dir) if "SUDO_USER" in os.environ else Path.home()
 
+def get_target_uid():
+    """UID de l'utilisateur réel, y compris sous sudo/pkexec (os.getlogin() échoue sans TTY).
+    Lancé directement en root, on retient le propriétaire de HOME ; None si introuvable."""
+    uid = os.environ.get("SUDO_UID") or os.environ.get("PKEXEC_UID")
+    if uid: return int(uid)
+    try: return HOME.stat().st_uid
+    except OSError: return None
+
+TARGET_UID = get_target_uid()
+ICON_PATHS = [Path(__file__).resolve().parent/"DebianBoosterIcon.png", HOME/".local/share/icons/DebianBoosterIcon.png"]
+# Budget du premier affichage, vérifié avec --startup-time
+STARTUP_BUDGET_MS = float(os.environ.get("DEBIANBOOSTER_STARTUP_BUDGET_MS", 500))
+
 def run(cmd, use_sudo=False):
     if isinstance(cmd, str): cmd = cmd.split()
     if use_sudo and os.geteuid() != 0: cmd = ["sudo"] + cmd
     r = subprocess.run(cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     return r.returncode, r.stdout.strip(), r.stderr.strip()
 
+def run_checked(cmd, use_sudo=False):
+    rc, out, err = run(cmd, use_sudo)
+    if rc != 0: raise OSError(err or f"{' '.join(cmd)} : code {rc}")
+    return out
+
 def get_sysctl_param(param):
     rc, out, _ = run(["sysctl", "-n", param])
     return out if rc == 0 else "inconnu"
@@ -21,15 +40,23 @@ def get_sysctl_param(param):
 def set_sysctl_param(param, value, use_sudo=True):
     cmd = (
         f"/bin/grep -q '^{param}' /etc/sysctl.conf && "
-        f"/bin/sed -i 's|^{param}=.*|{param}={value}|' /etc/sysctl.conf || "
+        f"/bin/sed -i 's|^{param}[ =].*|{param}={value}|' /etc/sysctl.conf || "
         f"/bin/echo '{param}={value}' >> /etc/sysctl.conf"
     )
-    run(cmd, use_sudo)
-    run(["sysctl", "-p"], use_sudo)
+    run_checked(["sh", "-c", cmd], use_sudo)
+    run_checked(["sysctl", "-w", f"{param}={value}"], use_sudo)
 
 def remove_sysctl_param(param, use_sudo=True):
-    run(f"/bin/sed -i '/{param}/d' /etc/sysctl.conf", use_sudo)
-    run(["sysctl", "-p"], use_sudo)
+    run_checked(["/bin/sed", "-i", f"/^{param}[ =]/d", "/etc/sysctl.conf"], use_sudo)
+
+def get_sysctl_conf_value(param):
+    """Valeur de `param` dans /etc/sysctl.conf, ou None si absent."""
+    try:
+        for line in Path("/etc/sysctl.conf").read_text().splitlines():
+            k, sep, v = line.partition("=")
+            if sep and k.strip() == param: return v.strip()
+    except OSError: pass
+    return None
 
 def get_cpu_governor():
     try:
@@ -37,10 +64,17 @@ def get_cpu_governor():
         return ','.join(sorted(govs)) if govs else 'inconnu'
     except: return 'inconnu'
 
-def set_cpu_governor(gov, use_sudo=True): run(["cpupower","frequency-set","-g",gov], use_sudo)
+def get_cpu_governors():
+    govs = {}
+    for p in Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/scaling_governor'):
+        try: govs[p.parent.parent.name] = p.read_text().strip()
+        except OSError: continue
+    return govs
+
+def set_cpu_governor(gov, use_sudo=True, cpus=None):
+    cpu_arg = ["-c", ",".join(c.replace("cpu", "") for c in cpus)] if cpus else []
+    run_checked(["cpupower"] + cpu_arg + ["frequency-set","-g",gov], use_sudo)
 def zram_enabled(): return run(["systemctl","is-enabled","zramswap"])[0] == 0
-def enable_zram(use_sudo=True): run(["systemctl","enable","--now","zramswap"], use_sudo)
-def disable_zram(use_sudo=True): run(["systemctl","disable","--now","zramswap"], use_sudo)
 
 def get_io_schedulers():
     scheds = {}
@@ -49,13 +83,234 @@ def get_io_schedulers():
         except: scheds[d.name] = 'inconnu'
     return scheds
 
-def set_io_scheduler(scheduler, use_sudo=True):
-    for d in Path('/sys/block').glob('sd*'):
-        run(f"echo {scheduler} | sudo tee /sys/block/{d.name}/queue/scheduler", use_sudo)
+def parse_io_scheduler(raw):
+    """'mq-deadline [bfq] none' -> ('bfq', ['mq-deadline', 'bfq', 'none'])"""
+    m = re.search(r"\[(\S+)\]", raw)
+    return (m.group(1) if m else None), raw.replace("[", "").replace("]", "").split()
+
+def set_io_scheduler(scheduler, use_sudo=True, device=None):
+    devs = [device] if device else [d.name for d in Path('/sys/block').glob('sd*')]
+    for dev in devs:
+        run_checked(["sh", "-c", f"echo {scheduler} > /sys/block/{dev}/queue/scheduler"], use_sudo)
 
 def service_enabled(name): return run(["systemctl","is-enabled",name])[0] == 0
 def set_service(name, enable=True, use_sudo=True):
-    run(["systemctl", "enable" if enable else "disable", "--now", name], use_sudo)
+    run_checked(["systemctl", "enable" if enable else "disable", "--now", name], use_sudo)
+
+def get_service_state(name):
+    _, enabled, _ = run(["systemctl","is-enabled",name])
+    _, active, _ = run(["systemctl","is-active",name])
+    return {"enabled": enabled or "inconnu", "active": active == "active"}
+
+def restore_service_state(name, state, use_sudo=True):
+    if state["enabled"] in ("enabled", "disabled"):
+        run_checked(["systemctl", "enable" if state["enabled"] == "enabled" else "disable", name], use_sudo)
+    if state["enabled"] not in ("not-found", "inconnu", "masked"):
+        run_checked(["systemctl", "start" if state["active"] else "stop", name], use_sudo)
+
+# ---------------- Profils de performance ----------------
+SYSCTL_KEYS = {"swappiness": "vm.swappiness", "hugepages": "vm.nr_hugepages"}
+SERVICE_KEYS = {"zram": "zramswap", "bluetooth": "bluetooth", "cups": "cups"}
+
+# iosched : liste par ordre de préférence, le premier disponible sur le disque est retenu
+PERF_PROFILES = {
+    "desktop-latency": {"swappiness": "10", "hugepages": "0", "governor": "performance", "zram": True,
+                        "iosched": ["bfq", "mq-deadline", "none"], "bluetooth": True, "cups": False},
+    "build-server": {"swappiness": "10", "hugepages": "128", "governor": "performance", "zram": False,
+                     "iosched": ["mq-deadline", "none", "noop"], "bluetooth": False, "cups": False},
+    "battery": {"swappiness": "60", "hugepages": "0", "governor": "powersave", "zram": True,
+                "iosched": ["bfq", "mq-deadline"], "bluetooth": False, "cups": False},
+}
+
+STATE_FILE = Path("/var/lib/DebianBooster/perf_state.json")
+STATE_VERSION = 1
+
+def load_perf_state(path=STATE_FILE):
+    try: data = json.loads(path.read_text())
+    except FileNotFoundError: return {"version": STATE_VERSION, "history": []}
+    except json.JSONDecodeError:
+        # mis de côté pour ne pas bloquer les applications suivantes
+        bad = path.with_name(f"{path.name}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}")
+        os.replace(path, bad)
+        raise ValueError(f"fichier d'état corrompu, déplacé vers {bad} ; les instantanés précédents sont perdus")
+    if data.get("version") != STATE_VERSION:
+        raise ValueError(f"version de {path} non supportée : {data.get('version')}")
+    return data
+
+def save_perf_state(state, path=STATE_FILE):
+    # écriture atomique : un instantané à moitié écrit rendrait le revert impossible
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        f.write(json.dumps(state, indent=2))
+        f.flush(); os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def take_perf_snapshot(keys):
+    snap = {}
+    for k in keys:
+        if k in SYSCTL_KEYS:
+            param = SYSCTL_KEYS[k]
+            snap[k] = {"runtime": get_sysctl_param(param), "conf": get_sysctl_conf_value(param)}
+        elif k == "governor":
+            snap[k] = get_cpu_governors()
+        elif k == "iosched":
+            snap[k] = {dev: parse_io_scheduler(raw)[0] for dev, raw in get_io_schedulers().items()}
+        elif k in SERVICE_KEYS:
+            snap[k] = get_service_state(SERVICE_KEYS[k])
+    return snap
+
+def apply_perf_value(k, value):
+    if k in SYSCTL_KEYS:
+        set_sysctl_param(SYSCTL_KEYS[k], value)
+        return f"{k} -> {value}"
+    if k == "governor":
+        set_cpu_governor(value)
+        return f"governor CPU -> {value}"
+    if k == "iosched":
+        done = []
+        for dev, raw in get_io_schedulers().items():
+            avail = parse_io_scheduler(raw)[1]
+            sched = next((s for s in value if s in avail), None)
+            if sched:
+                set_io_scheduler(sched, device=dev); done.append(f"{dev}:{sched}")
+        return f"I/O scheduler -> {', '.join(done) or 'aucun disque compatible'}"
+    if k in SERVICE_KEYS:
+        set_service(SERVICE_KEYS[k], enable=value)
+        return f"{SERVICE_KEYS[k]} -> {'activé' if value else 'désactivé'}"
+    raise KeyError(k)
+
+def restore_perf_value(k, saved):
+    if k in SYSCTL_KEYS:
+        param = SYSCTL_KEYS[k]
+        if saved["conf"] is None: remove_sysctl_param(param)
+        else: set_sysctl_param(param, saved["conf"])
+        if saved["runtime"] != "inconnu": run_checked(["sysctl", "-w", f"{param}={saved['runtime']}"], True)
+        return f"{k} -> {saved['runtime']} (restauré)"
+    if k == "governor":
+        by_gov = {}
+        for cpu, gov in saved.items(): by_gov.setdefault(gov, []).append(cpu)
+        for gov, cpus in by_gov.items(): set_cpu_governor(gov, cpus=sorted(cpus, key=lambda c: int(c[3:])))
+        return f"governor CPU -> {','.join(sorted(set(saved.values()))) or 'inconnu'} (restauré)"
+    if k == "iosched":
+        for dev, sched in saved.items():
+            if sched: set_io_scheduler(sched, device=dev)
+        return f"I/O scheduler -> {','.join(f'{d}:{s}' for d, s in saved.items())} (restauré)"
+    if k in SERVICE_KEYS:
+        restore_service_state(SERVICE_KEYS[k], saved)
+        return f"{SERVICE_KEYS[k]} -> {saved['enabled']}, {'actif' if saved['active'] else 'inactif'} (restauré)"
+    raise KeyError(k)
+
+def run_micro_benchmark(cpu_iter=2_000_000, mem_mb=64, fsync_n=20):
+    """Mesures rapides : boucle CPU (ms), débit mémoire (Mo/s), latence fsync (ms, médiane)."""
+    t = time.perf_counter(); x = 0
+    for i in range(cpu_iter): x += i ^ (i >> 3)
+    cpu_ms = (time.perf_counter() - t) * 1000
+
+    buf = bytearray(mem_mb * 1024 * 1024); passes = 4
+    t = time.perf_counter()
+    for _ in range(passes): bytes(buf)
+    mem_mbs = passes * mem_mb / (time.perf_counter() - t)
+    del buf
+
+    lat = []; block = b"\0" * 4096
+    with tempfile.TemporaryFile(dir="/var/tmp") as f:
+        for _ in range(fsync_n):
+            f.write(block); f.flush()
+            t = time.perf_counter(); os.fsync(f.fileno())
+            lat.append((time.perf_counter() - t) * 1000)
+    return {"cpu_loop_ms": round(cpu_ms, 2), "mem_bw_mbs": round(mem_mbs, 1), "fsync_ms": round(statistics.median(lat), 3)}
+
+def compare_benchmarks(before, after):
+    lines = []
+    for k, label, lower_is_better in (("cpu_loop_ms", "Boucle CPU (ms)", True), ("mem_bw_mbs", "Débit mémoire (Mo/s)", False), ("fsync_ms", "Latence fsync (ms)", True)):
+        b, a = before[k], after[k]
+        delta = (a - b) / b * 100 if b else 0.0
+        gain = round(-delta if lower_is_better else delta, 1) + 0.0
+        lines.append(f"{label} : {b} -> {a} ({'+' if gain >= 0 else ''}{gain:.1f}% {'mieux' if gain >= 0 else 'moins bien'})")
+    return lines
+
+# ---------------- Affinité IRQ / CPU ----------------
+# Périphériques dont les interruptions méritent d'être éloignées du compositeur et de l'audio
+IRQ_DEVICE_RE = re.compile(r"\b(nvme|eth|en[ops]|wl|iwlwifi|mlx|igb|ixgbe|e1000|r8169|virtio)")
+AFFINITY_DROPIN = "50-debianbooster-affinity.conf"
+
+def parse_cpu_list(text):
+    """'0-2,5' -> [0, 1, 2, 5] ; ValueError si la liste est invalide."""
+    cpus = set()
+    for part in text.replace(" ", "").split(","):
+        if not part: continue
+        lo, sep, hi = part.partition("-")
+        cpus.update(range(int(lo), int(hi if sep else lo) + 1))
+    if not cpus: raise ValueError(f"liste de CPU vide : {text!r}")
+    return sorted(cpus)
+
+def format_cpu_list(cpus):
+    return ",".join(str(c) for c in sorted(cpus))
+
+def read_interrupts(path="/proc/interrupts"):
+    """Instantané de /proc/interrupts : {'t', 'ncpu', 'irqs': {irq: (compteurs par CPU, description)}}."""
+    irqs = {}
+    with open(path) as f:
+        ncpu = len(f.readline().split())
+        for line in f:
+            name, sep, rest = line.partition(":")
+            if not sep: continue
+            fields = rest.split()
+            counts = [int(x) for x in fields[:ncpu] if x.isdigit()]
+            irqs[name.strip()] = (counts, " ".join(fields[len(counts):]))
+    return {"t": time.monotonic(), "ncpu": ncpu, "irqs": irqs}
+
+def interrupt_rates(prev, cur):
+    """Interruptions/s par CPU et par IRQ entre deux instantanés de read_interrupts()."""
+    dt = (cur["t"] - prev["t"]) or 1e-9
+    per_cpu = [0.0] * cur["ncpu"]; per_irq = {}
+    for irq, (counts, _) in cur["irqs"].items():
+        old = prev["irqs"].get(irq)
+        if not old: continue
+        deltas = [max(0, c - o) for c, o in zip(counts, old[0])]
+        per_irq[irq] = sum(deltas) / dt
+        for i, d in enumerate(deltas): per_cpu[i] += d / dt
+    return per_cpu, per_irq
+
+# Files d'E/S NVMe (nvme0q1...) : affinité gérée par le noyau, l'écriture renvoie EIO
+MANAGED_IRQ_RE = re.compile(r"\bnvme\d+q[1-9]\d*\b")
+
+def is_device_irq(irq, desc):
+    return irq.isdigit() and bool(IRQ_DEVICE_RE.search(desc))
+
+def is_managed_irq(desc):
+    return bool(MANAGED_IRQ_RE.search(desc))
+
+def irqbalance_active():
+    return run(["systemctl", "is-active", "irqbalance"])[1] == "active"
+
+def get_irq_affinity(irq):
+    try: return Path(f"/proc/irq/{irq}/smp_affinity_list").read_text().strip()
+    except OSError: return "inconnu"
+
+def set_irq_affinity(irq, cpus, use_sudo=True):
+    run_checked(["sh", "-c", f"echo {format_cpu_list(cpus)} > /proc/irq/{irq}/smp_affinity_list"], use_sudo)
+
+def plan_irq_spread(irqs, cpus):
+    """Répartition en tourniquet des IRQ sur `cpus` : {irq: cpu}."""
+    return {irq: cpus[i % len(cpus)] for i, irq in enumerate(sorted(irqs, key=int))}
+
+def get_unit_cpu_affinity(unit):
+    _, out, _ = run(["systemctl", "show", "-p", "CPUAffinity", "-p", "AllowedCPUs", unit])
+    return dict(l.split("=", 1) for l in out.splitlines() if "=" in l)
+
+def set_unit_cpu_affinity(unit, cpus, use_sudo=True):
+    """Drop-in CPUAffinity/AllowedCPUs pour `unit` ; cpus=None supprime le drop-in."""
+    dropin = Path("/etc/systemd/system") / f"{unit}.d" / AFFINITY_DROPIN
+    if cpus is None:
+        run_checked(["rm", "-f", str(dropin)], use_sudo)
+    else:
+        lst = format_cpu_list(cpus)
+        cmd = (f"mkdir -p {shlex.quote(str(dropin.parent))} && "
+               f"printf '%s\\n' '[Service]' 'CPUAffinity={lst}' 'AllowedCPUs={lst}' > {shlex.quote(str(dropin))}")
+        run_checked(["sh", "-c", cmd], use_sudo)
+    run_checked(["systemctl", "daemon-reload"], use_sudo)
 
 def confirm_action(parent, text):
     return QtWidgets.QMessageBox.question(parent, "Confirmation", text,
@@ -76,49 +331,115 @@ def safe_rmtree(path):
     try: shutil.rmtree(path); return True
     except: return False
 
+TMPFILES_DIRS = ["/etc/tmpfiles.d", "/run/tmpfiles.d", "/usr/local/lib/tmpfiles.d", "/usr/lib/tmpfiles.d"]
+
+def load_tmpfiles_exclusions(dirs=TMPFILES_DIRS):
+    """Motifs x (chemin et contenu) et X (chemin seul) des configurations systemd-tmpfiles."""
+    confs = {}
+    for d in reversed(dirs):  # un fichier de même nom dans /etc masque celui de /usr/lib
+        try: confs.update({f.name: f for f in Path(d).glob("*.conf")})
+        except OSError: continue
+    subtree, single = [], []
+    for f in confs.values():
+        try: lines = f.read_text().splitlines()
+        except OSError: continue
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 2 or fields[0][0] not in "xX": continue
+            # spécificateurs (%b, %U...) remplacés par un joker : exclusion plus large, donc plus sûre
+            pattern = re.sub(r"%.", "*", fields[1])
+            (subtree if fields[0][0] == "x" else single).append(pattern)
+    return subtree, single
+
+def open_file_ids():
+    """(st_dev, st_ino) des fichiers ouverts et répertoires courants de tous les processus."""
+    ids = set()
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit(): continue
+        links = [f"/proc/{pid}/cwd"]
+        try: links += [f"/proc/{pid}/fd/{fd}" for fd in os.listdir(f"/proc/{pid}/fd")]
+        except OSError: pass
+        for link in links:
+            try: st = os.stat(link)
+            except OSError: continue
+            ids.add((st.st_dev, st.st_ino))
+    return ids
+
+def iter_clean_tmp(root, max_age, uid=None, exclusions=None, open_ids=None):
+    """Supprime sous `root` les fichiers plus vieux que `max_age` secondes, en flux.
+
+    Un seul lstat par entrée ; l'âge est jugé fichier par fichier et un répertoire
+    n'est supprimé qu'une fois vide. Si `uid` est donné, seules ses entrées sont
+    touchées. Produit (chemin, None) pour chaque suppression, (chemin, erreur) en cas d'échec.
+    """
+    subtree, single = load_tmpfiles_exclusions() if exclusions is None else exclusions
+    open_ids = open_file_ids() if open_ids is None else open_ids
+    cutoff = time.time() - max_age
+
+    def removable(path, st):
+        return ((uid is None or st.st_uid == uid)
+                and max(st.st_atime, st.st_mtime, st.st_ctime) < cutoff
+                and (st.st_dev, st.st_ino) not in open_ids
+                and not any(fnmatch.fnmatchcase(path, p) for p in single))
+
+    # Parcours par descripteurs (comme shutil.rmtree) : un répertoire remplacé par un
+    # lien symbolique pendant le parcours ne peut pas faire sortir de `root`.
+    # Pile de (itérateur scandir, fd, chemin, nom, lstat) : mémoire bornée par la profondeur
+    flags = os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW
+    try:
+        root_fd = os.open(root, flags)
+        root_dev = os.fstat(root_fd).st_dev
+        stack = [(os.scandir(root_fd), root_fd, root, None, None)]
+    except FileNotFoundError: return
+    except OSError as e:
+        yield root, e; return
+    try:
+        while stack:
+            it, fd, dir_path, dir_name, dir_st = stack[-1]
+            entry = next(it, None)
+            if entry is None:
+                it.close(); os.close(fd); stack.pop()
+                if dir_name and removable(dir_path, dir_st):
+                    try: os.rmdir(dir_name, dir_fd=stack[-1][1])
+                    except OSError: continue  # non vide : du contenu récent ou protégé subsiste
+                    yield dir_path, None
+                continue
+            name = entry.name; path = os.path.join(dir_path, name)
+            try: st = os.stat(name, dir_fd=fd, follow_symlinks=False)
+            except OSError: continue
+            if st.st_dev != root_dev or any(fnmatch.fnmatchcase(path, p) for p in subtree):
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                try: sub_fd = os.open(name, flags, dir_fd=fd)
+                except OSError as e:
+                    yield path, e; continue
+                sub_st = os.fstat(sub_fd)
+                if (sub_st.st_dev, sub_st.st_ino) != (st.st_dev, st.st_ino):
+                    os.close(sub_fd); continue  # remplacé depuis le lstat
+                try: stack.append((os.scandir(sub_fd), sub_fd, path, name, st))
+                except OSError as e:
+                    os.close(sub_fd); yield path, e
+            elif (stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode)) and removable(path, st):
+                try: os.unlink(name, dir_fd=fd)
+                except OSError as e:
+                    yield path, e; continue
+                yield path, None
+    finally:
+        for it, fd, *_ in stack:
+            it.close(); os.close(fd)
+
 def clean_caches(actions):
     results = []
 
-    def clean_tmp_ultrasafe():
-        cutoff_recent = time.time() - 3600  # 1 heure
-        count = 0
-        current_user = os.getlogin()
-        tmp_dir = Path("/tmp")
-        if not tmp_dir.exists():
-            return 0
-        for p in tmp_dir.iterdir():
-            try:
-                # On ne touche que les fichiers appartenant à l'utilisateur courant
-                if hasattr(p, 'owner') and p.owner() != current_user:
-                    continue
-                # Ignorer fichiers récents
-                if p.stat().st_mtime > cutoff_recent:
-                    continue
-                if p.is_file():
-                    p.unlink()
-                    count += 1
-                elif p.is_dir():
-                    count += safe_rmtree(p)
-            except Exception:
-                continue
-        return count
-
-    def clean_var_tmp_safe(aggressive=False):
-        cutoff = time.time() - 30*86400  # 30 jours
-        count = 0
-        var_tmp = Path("/var/tmp")
-        if not var_tmp.exists():
-            return 0  # Rien à supprimer si le dossier n'existe pas
-        for p in var_tmp.iterdir():
-            try:
-                if p.is_file() and (aggressive or p.stat().st_mtime < cutoff):
-                    p.unlink()
-                    count += 1
-                elif p.is_dir():
-                    count += safe_rmtree(p)
-            except Exception:
-                continue
-        return count
+    ctx = {}
+    def clean_tmp(root, max_age, uid=None):
+        # exclusions et fichiers ouverts calculés une seule fois pour /tmp et /var/tmp
+        if not ctx: ctx.update(exclusions=load_tmpfiles_exclusions(), open_ids=open_file_ids())
+        deleted = errors = 0
+        for _, err in iter_clean_tmp(root, max_age, uid, **ctx):
+            if err is None: deleted += 1
+            else: errors += 1
+        return deleted, f" ({errors} erreurs)" if errors else ""
 
     for a in actions:
         try:
@@ -153,16 +474,19 @@ def clean_caches(actions):
                 results.append((a, f"[✓] {count} fichiers journaux KDE supprimés"))
 
             elif a == "tmp":
-                count = clean_tmp_ultrasafe()
-                results.append((a, f"[✓] {count} fichiers/dossiers supprimés dans /tmp (ultra-safe)"))
+                if not TARGET_UID:
+                    results.append((a, "[!] /tmp ignoré : utilisateur réel introuvable (lancer via sudo ou pkexec)"))
+                    continue
+                count, errs = clean_tmp("/tmp", 3600, uid=TARGET_UID)
+                results.append((a, f"[✓] {count} fichiers/dossiers supprimés dans /tmp (ultra-safe){errs}"))
 
             elif a == "var_tmp":
-                count = clean_var_tmp_safe(aggressive=False)
-                results.append((a, f"[✓] {count} fichiers/dossiers anciens supprimés dans /var/tmp"))
+                count, errs = clean_tmp("/var/tmp", 30*86400)
+                results.append((a, f"[✓] {count} fichiers/dossiers anciens supprimés dans /var/tmp{errs}"))
 
             elif a == "var_tmp_aggressive":
-                count = clean_var_tmp_safe(aggressive=True)
-                results.append((a, f"[✓] purge agressive : {count} fichiers/dossiers supprimés dans /var/tmp"))
+                count, errs = clean_tmp("/var/tmp", 0)
+                results.append((a, f"[✓] purge agressive : {count} fichiers/dossiers supprimés dans /var/tmp{errs}"))
 
             else:
                 count = 0
@@ -199,23 +523,53 @@ class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Debian KDE Booster")
-        self.setWindowIcon(QIcon("/home/cattac/.local/share/icons/DebianBoosterIcon.png"))
+        icon = next((p for p in ICON_PATHS if p.exists()), None)
+        if icon: self.setWindowIcon(QIcon(str(icon)))
         self.resize(1000,800)
         self.pool = QtCore.QThreadPool(); self.pool.setMaxThreadCount(2)
         self.tabs = QtWidgets.QTabWidget(); self.setCentralWidget(self.tabs)
-
-        # ---- setup onglets ----
-        self.setup_clean_tab()
-        self.setup_perf_tab()
-        self.setup_services_tab()
-        self.setup_inactive_services_tab()
-        self.refresh_perf()
+        self.first_paint_ms = None
+        self.exit_after_paint = False
+
+        # ---- onglets : contenu construit à la première visite ----
+        self.tab_clean, self.tab_perf, self.tab_services, self.tab_inactive, self.tab_affinity = (QtWidgets.QWidget() for _ in range(5))
+        self.tab_builders = {}
+        for w, title, builder in ((self.tab_clean, "Nettoyage", self.setup_clean_tab),
+                                  (self.tab_perf, "Performance", self.setup_perf_tab),
+                                  (self.tab_services, "Services actifs", self.setup_services_tab),
+                                  (self.tab_inactive, "Services inactifs", self.setup_inactive_services_tab),
+                                  (self.tab_affinity, "Affinité IRQ/CPU", self.setup_affinity_tab)):
+            self.tabs.addTab(w, title)
+            self.tab_builders[w] = builder
 
         # Timer services
         self.services_timer = QtCore.QTimer(); self.services_timer.setInterval(5000)
         self.services_timer.timeout.connect(self.refresh_active_service_tab)
+        self.irq_timer = QtCore.QTimer(); self.irq_timer.setInterval(2000)
+        self.irq_timer.timeout.connect(self.refresh_irq_tab)
         self.tabs.currentChanged.connect(self.on_tab_changed)
 
+    # ---------------- Démarrage ----------------
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.first_paint_ms is None:
+            self.first_paint_ms = (time.perf_counter() - STARTUP_T0) * 1000
+            QtCore.QTimer.singleShot(0, self.after_first_paint)
+
+    def after_first_paint(self):
+        if self.exit_after_paint:
+            print(f"first_paint_ms={self.first_paint_ms:.1f} budget_ms={STARTUP_BUDGET_MS:.0f}")
+            QtWidgets.QApplication.instance().exit(0 if self.first_paint_ms <= STARTUP_BUDGET_MS else 1)
+            return
+        msg = f"Prêt en {self.first_paint_ms:.0f} ms"
+        if os.geteuid() != 0: msg += " — Non root — certaines actions nécessitent sudo"
+        self.statusBar().showMessage(msg)
+        self.ensure_tab_built(self.tabs.currentWidget())
+
+    def ensure_tab_built(self, widget):
+        builder = self.tab_builders.pop(widget, None)
+        if builder: builder()
+
     # ---------------- LOG UTILS ----------------
     def log_safe(self, widget, msg):
         clean_msg = msg.strip()
@@ -239,46 +593,9 @@ class MainWindow(QtWidgets.QMainWindow):
             self.log_perf.appendPlainText("\n" + "-"*40 + "\n")
         self.start_with_loader(self.refresh_perf, log_widget=self.log_perf)
         
-    def apply_perf(self, apply, selected):
-        results = []
-        keys = self.options.keys() if not selected else [k for k,(cb,_) in self.options.items() if cb.isChecked()]
-        if not keys:
-            results.append(("info","Aucune option sélectionnée"))
-            return results
-
-        results.append(("info", f"{'Application' if apply else 'Restauration'} : {', '.join(keys)}"))
-
-        for k in keys:
-            try:
-                if k == "governor":
-                    # appliquer/restaurer dans le thread principal
-                    gov_value = "performance" if apply else "powersave"
-                    QtCore.QTimer.singleShot(0, lambda val=gov_value: set_cpu_governor(val))
-
-                # Autres options (swappiness, hugepages, zram, iosched, services…) restent inchangées
-                results.append((k, f"{k} -> {'appliqué' if apply else 'restauré'}"))
-            except Exception as e:
-                results.append((k, f"{k} erreur : {e}"))
-
-        # Vérifier que le governor a bien changé avant de rafraîchir l'UI
-        def refresh_after_governor():
-            max_tries = 5
-            interval = 0.2
-            for _ in range(max_tries):
-                if "governor" in keys and get_cpu_governor() != ("performance" if apply else "powersave"):
-                    time.sleep(interval)
-                else:
-                    break
-            self.refresh_perf()  # refresh de l’UI dans le thread principal
-
-        QtCore.QTimer.singleShot(100, refresh_after_governor)  # petit délai avant vérif
-        return results
-        
     # ---- Nettoyage ----
     def setup_clean_tab(self):
         self.clean_options = {}
-        self.tab_clean = QtWidgets.QWidget()
-        self.tabs.addTab(self.tab_clean, "Nettoyage")
         clean_items = ["trash", "recent", "thumbnails", "firefox_cache", "journal_vacuum", "journal", "tmp", "var_tmp","var_tmp_aggressive", "system_cache", "drop_caches","apt_cache", "apt_autoremove", "kde_logs", "swap"]
         clean_titles = {"trash":"Corbeille","recent":"Documents récents","firefox_cache":"Cache Firefox","thumbnails":"Miniatures","apt_cache":"Cache APT","system_cache":"Cache système","tmp":"Mémoire temporaire","journal":"Journaux systemd","drop_caches":"Caches mémoire","swap":"Mémoire swap","apt_autoremove":"APT autoremove/autoclean","journal_vacuum":"Journalctl (vacuum 30j)","kde_logs":"Logs KDE/Plasma","var_tmp":"Mémoire temporaire (/var/tmp) - standard","var_tmp_aggressive":"Mémoire temporaire (/var/tmp) - purge agressive"}
         clean_desc = {"trash":"~/.local/share/Trash","recent":"~/.local/share/RecentDocuments","firefox_cache":"~/.cache/mozilla/firefox","thumbnails":"~/.cache/thumbnails","apt_cache":"/var/cache/apt","system_cache":"~/.cache/fontconfig, /var/cache/man, /var/cache/ldconfig, /var/cache/misc","tmp":"/tmp","journal":"/var/log/journal","drop_caches":"Caches mémoire du système","swap":"Mémoire swap","apt_autoremove":"apt-get autoremove & autoclean","journal_vacuum":"Réduit journaux systemd à 30 jours","kde_logs":"~/.xsession-errors et ~/.local/share/sddm","var_tmp":"Supprime uniquement les fichiers vieux de plus de 30 jours","var_tmp_aggressive":"Supprime tous les fichiers, attention risque d’impacter certains programmes"}
@@ -343,8 +660,6 @@ class MainWindow(QtWidgets.QMainWindow):
     # ---------------- Onglet Performance ----------------
     def setup_perf_tab(self):
         self.options = {}
-        self.tab_perf = QtWidgets.QWidget()
-        self.tabs.addTab(self.tab_perf,"Performance")
 
         # Options disponibles
         opts = [
@@ -358,6 +673,17 @@ class MainWindow(QtWidgets.QMainWindow):
         ]
 
         layout = QtWidgets.QVBoxLayout()
+        profile_layout = QtWidgets.QHBoxLayout()
+        profile_layout.addWidget(QtWidgets.QLabel("Profil :"))
+        self.profile_combo = QtWidgets.QComboBox()
+        self.profile_combo.addItems(list(PERF_PROFILES))
+        profile_layout.addWidget(self.profile_combo)
+        self.cb_bench = QtWidgets.QCheckBox("Micro-benchmark avant/après")
+        self.cb_bench.setChecked(True)
+        profile_layout.addWidget(self.cb_bench)
+        profile_layout.addStretch()
+        layout.addLayout(profile_layout)
+
         opts_group = QtWidgets.QGroupBox("Options")
         opts_layout = QtWidgets.QGridLayout()
         opts_group.setLayout(opts_layout)
@@ -395,6 +721,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_revert_sel.clicked.connect(lambda: self.confirmed_apply_perf(False, True))
         self.btn_apply_all.clicked.connect(lambda: self.confirmed_apply_perf(True, False))
         self.btn_revert_all.clicked.connect(lambda: self.confirmed_apply_perf(False, False))
+        self.refresh_perf(modal=False)
 
     def confirmed_refresh_perf(self):
         if confirm_action(self,"Confirmer le rafraîchissement ?"):
@@ -405,7 +732,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self.apply_perf(apply, selected)
 
     # ------------------ refresh_perf thread-safe ------------------
-    def refresh_perf(self):
+    def refresh_perf(self, modal=True):
         def update_ui(data):
             sw, hp, gov, zram, ios, bt, cups = data
             self.options["swappiness"][1].setText(sw)
@@ -428,56 +755,70 @@ class MainWindow(QtWidgets.QMainWindow):
                 service_enabled("cups")
             )
 
-        loader = QtWidgets.QProgressDialog("Rafraîchissement en cours...", None, 0, 0, self)
-        loader.setWindowModality(QtCore.Qt.ApplicationModal)
-        loader.setCancelButton(None)
-        loader.show()
-
         w = Worker(worker_fn)
         w.signals.result.connect(update_ui)
-        w.signals.finished.connect(loader.close)
+        if modal:
+            loader = QtWidgets.QProgressDialog("Rafraîchissement en cours...", None, 0, 0, self)
+            loader.setWindowModality(QtCore.Qt.ApplicationModal)
+            loader.setCancelButton(None)
+            loader.show()
+            w.signals.finished.connect(loader.close)
         self.pool.start(w)
 
 
     # ------------------ apply_perf thread-safe ------------------
     def apply_perf(self, apply, selected):
-        keys = self.options.keys() if not selected else [k for k,(cb,_) in self.options.items() if cb.isChecked()]
+        keys = list(self.options.keys()) if not selected else [k for k,(cb,_) in self.options.items() if cb.isChecked()]
         if not keys:
             self.log_perf.appendPlainText("Aucune option sélectionnée")
             return
-
-        def worker_fn():
-            res = []
+        if os.geteuid() != 0:
+            # l'instantané doit être écrit dans STATE_FILE avant toute modification
+            self.log_perf.appendPlainText(f"[Erreur] Profils : droits root requis pour enregistrer l'instantané ({STATE_FILE}) — relancer via DebianBooster.sh")
+            return
+        profile = self.profile_combo.currentText()
+        bench = self.cb_bench.isChecked()
+
+        def apply_fn():
+            state = load_perf_state()
+            res = [("info", f"Profil {profile} : {', '.join(keys)}")]
+            # l'instantané est enregistré avant toute modification pour garantir le revert
+            entry = {"profile": profile, "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                     "snapshot": take_perf_snapshot(keys)}
+            state["history"].append(entry)
+            save_perf_state(state)
+            before = run_micro_benchmark() if bench else None
             for k in keys:
-                try:
-                    if k == "swappiness":
-                        val = "10" if apply else "60"
-                        set_sysctl_param("vm.swappiness", val)
-                        res.append((k, f"swappiness -> {val}"))
-                    elif k == "hugepages":
-                        val = "128" if apply else "0"
-                        set_sysctl_param("vm.nr_hugepages", val)
-                        res.append((k, f"hugepages -> {val}"))
-                    elif k == "governor":
-                        val = "performance" if apply else "powersave"
-                        set_cpu_governor(val)
-                        res.append((k, f"governor CPU -> {val}"))
-                    elif k == "zram":
-                        if apply: enable_zram()
-                        else: disable_zram()
-                        res.append((k, f"ZRAM -> {'activé' if apply else 'désactivé'}"))
-                    elif k == "iosched":
-                        val = "noop" if apply else "cfq"
-                        set_io_scheduler(val)
-                        res.append((k, f"I/O scheduler -> {val}"))
-                    elif k == "bluetooth":
-                        set_service("bluetooth", enable=not apply)
-                        res.append((k, f"Bluetooth -> {'activé' if not apply else 'désactivé'}"))
-                    elif k == "cups":
-                        set_service("cups", enable=not apply)
-                        res.append((k, f"CUPS -> {'activé' if not apply else 'désactivé'}"))
+                try: res.append((k, apply_perf_value(k, PERF_PROFILES[profile][k])))
                 except Exception as e:
                     res.append((k, f"[Erreur] {e}"))
+                    entry.setdefault("errors", {})[k] = str(e)
+            save_perf_state(state)
+            if bench:
+                entry["benchmark"] = {"before": before, "after": run_micro_benchmark()}
+                save_perf_state(state)
+                res += [("bench", l) for l in compare_benchmarks(before, entry["benchmark"]["after"])]
+            return res
+
+        def revert_fn():
+            state = load_perf_state()
+            # les entrées restaurées sont conservées avec leur benchmark, marquées "reverted"
+            entry = next((e for e in reversed(state["history"]) if "reverted" not in e), None)
+            if entry is None:
+                return [("info", "Aucun instantané à restaurer")]
+            done = entry.setdefault("reverted_keys", [])
+            todo = [k for k in keys if k in entry["snapshot"] and k not in done]
+            if not todo:
+                return [("info", f"Aucune option sélectionnée dans l'instantané {entry['profile']} ({entry['timestamp']})")]
+            res = [("info", f"Restauration de l'instantané {entry['profile']} ({entry['timestamp']}) : {', '.join(todo)}")]
+            for k in todo:
+                try:
+                    res.append((k, restore_perf_value(k, entry["snapshot"][k])))
+                    done.append(k)
+                except Exception as e: res.append((k, f"[Erreur] {e}"))
+            if set(done) >= set(entry["snapshot"]):
+                entry["reverted"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            save_perf_state(state)
             return res
 
         def update_ui(res):
@@ -492,14 +833,13 @@ class MainWindow(QtWidgets.QMainWindow):
         loader.setCancelButton(None)
         loader.show()
 
-        w = Worker(worker_fn)
+        w = Worker(apply_fn if apply else revert_fn)
         w.signals.result.connect(update_ui)
+        w.signals.error.connect(lambda e: self.log_perf.appendPlainText(f"[Erreur] {e}"))
         w.signals.finished.connect(loader.close)
         self.pool.start(w)
 
     def setup_services_tab(self):
-        self.tab_services = QtWidgets.QWidget()
-        self.tabs.addTab(self.tab_services,"Services actifs")
         layout = QtWidgets.QVBoxLayout()
         self.tab_services.setLayout(layout)
         self.services_table = QtWidgets.QTableWidget()
@@ -517,8 +857,6 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ppid_cache = {}
 
     def setup_inactive_services_tab(self):
-        self.tab_inactive = QtWidgets.QWidget()
-        self.tabs.insertTab(self.tabs.indexOf(self.tab_services)+1, self.tab_inactive, "Services inactifs")
         layout = QtWidgets.QVBoxLayout()
         self.tab_inactive.setLayout(layout)
         self.inactive_table = QtWidgets.QTableWidget()
@@ -535,12 +873,17 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def on_tab_changed(self, index):
         widget = self.tabs.widget(index)
-        if widget in (getattr(self, 'tab_services', None), getattr(self, 'tab_inactive', None)):
+        self.ensure_tab_built(widget)
+        if widget in (self.tab_services, self.tab_inactive):
             self.services_timer.start()
             if widget == self.tab_services: self.refresh_services()
             else: self.refresh_inactive_services()
         else:
             self.services_timer.stop()
+        if widget == self.tab_affinity:
+            self.irq_timer.start(); self.refresh_irq_tab()
+        else:
+            self.irq_timer.stop()
 
     def refresh_active_service_tab(self):
         current = self.tabs.currentWidget()
@@ -589,6 +932,7 @@ class MainWindow(QtWidgets.QMainWindow):
         menu.addAction("Redémarrer", lambda: self.confirmed_control_service(svc,"restart"))
         menu.addAction("Stopper", lambda: self.confirmed_control_service(svc,"stop"))
         menu.addAction("Voir processus", lambda: self.show_service_processes(svc))
+        menu.addAction("Affinité CPU…", lambda: self.edit_unit_affinity(svc, self.log_services))
         menu.exec_(self.services_table.viewport().mapToGlobal(pos))
 
     def on_inactive_context(self,pos):
@@ -597,6 +941,7 @@ class MainWindow(QtWidgets.QMainWindow):
         row=item.row(); svc=self.inactive_table.item(row,0).text()
         menu=QtWidgets.QMenu()
         menu.addAction("Démarrer", lambda: self.confirmed_control_service(svc,"start"))
+        menu.addAction("Affinité CPU…", lambda: self.edit_unit_affinity(svc, self.log_inactive))
         menu.exec_(self.inactive_table.viewport().mapToGlobal(pos))
 
     def confirmed_control_service(self,svc,action):
@@ -611,6 +956,127 @@ class MainWindow(QtWidgets.QMainWindow):
         w.signals.finished.connect(lambda: self.refresh_inactive_services() if action=="start" else self.refresh_services())
         self.pool.start(w)
 
+    def edit_unit_affinity(self, svc, log_widget):
+        cur = get_unit_cpu_affinity(svc)
+        text, ok = QtWidgets.QInputDialog.getText(self, f"Affinité CPU de {svc}",
+            "CPUs (ex : 0-3,6) — vide pour supprimer le drop-in :", text=cur.get("CPUAffinity", ""))
+        if not ok: return
+        try:
+            cpus = parse_cpu_list(text) if text.strip() else None
+            if not confirm_action(self, f"Confirmer l'affinité {format_cpu_list(cpus) if cpus else 'par défaut'} pour {svc} ?"): return
+            set_unit_cpu_affinity(svc, cpus)
+            log_widget.appendPlainText(f"{svc} : affinité {format_cpu_list(cpus) if cpus else 'par défaut'} (effective au prochain redémarrage)")
+        except (ValueError, OSError) as e:
+            log_widget.appendPlainText(f"[Erreur] {svc} : {e}")
+
+    # ---------------- Onglet Affinité IRQ/CPU ----------------
+    def setup_affinity_tab(self):
+        layout = QtWidgets.QVBoxLayout()
+        self.cpu_rate_table = QtWidgets.QTableWidget()
+        self.cpu_rate_table.setColumnCount(2)
+        self.cpu_rate_table.setHorizontalHeaderLabels(["CPU","Interruptions/s"])
+        self.cpu_rate_table.setMaximumHeight(200)
+        layout.addWidget(self.cpu_rate_table)
+        self.irq_table = QtWidgets.QTableWidget()
+        self.irq_table.setColumnCount(4)
+        self.irq_table.setHorizontalHeaderLabels(["IRQ","Périphérique","Affinité","Interruptions/s"])
+        self.irq_table.horizontalHeader().setStretchLastSection(True)
+        self.irq_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        layout.addWidget(self.irq_table)
+
+        btn_layout = QtWidgets.QHBoxLayout()
+        btn_layout.addWidget(QtWidgets.QLabel("CPUs :"))
+        self.irq_cpus = QtWidgets.QLineEdit(); self.irq_cpus.setPlaceholderText("ex : 2-7")
+        btn_layout.addWidget(self.irq_cpus)
+        self.btn_irq_pin = QtWidgets.QPushButton("Épingler sélection")
+        self.btn_irq_spread = QtWidgets.QPushButton("Répartir sélection")
+        self.btn_irq_spread_dev = QtWidgets.QPushButton("Répartir NIC/NVMe")
+        for b in [self.btn_irq_pin, self.btn_irq_spread, self.btn_irq_spread_dev]:
+            btn_layout.addWidget(b)
+        layout.addLayout(btn_layout)
+        self.log_affinity = QtWidgets.QPlainTextEdit()
+        self.log_affinity.setReadOnly(True)
+        self.log_affinity.setMaximumHeight(120)
+        layout.addWidget(self.log_affinity)
+        self.tab_affinity.setLayout(layout)
+
+        self.btn_irq_pin.clicked.connect(lambda: self.confirmed_irq_affinity("pin", True))
+        self.btn_irq_spread.clicked.connect(lambda: self.confirmed_irq_affinity("spread", True))
+        self.btn_irq_spread_dev.clicked.connect(lambda: self.confirmed_irq_affinity("spread", False))
+        self.irq_prev = None
+        self.cpu_rates = []
+
+    def refresh_irq_tab(self):
+        try: cur = read_interrupts()
+        except OSError as e:
+            self.irq_timer.stop(); self.log_affinity.appendPlainText(f"[Erreur] {e}"); return
+        per_cpu, per_irq = interrupt_rates(self.irq_prev, cur) if self.irq_prev else ([0.0]*cur["ncpu"], {})
+        self.irq_prev, self.cpu_rates = cur, per_cpu
+
+        hot = max(per_cpu) if per_cpu else 0
+        self.cpu_rate_table.setUpdatesEnabled(False)
+        self.cpu_rate_table.setRowCount(len(per_cpu))
+        for cpu, rate in enumerate(per_cpu):
+            self.cpu_rate_table.setItem(cpu,0,QtWidgets.QTableWidgetItem(f"CPU{cpu}"))
+            item = QtWidgets.QTableWidgetItem(f"{rate:.0f}")
+            if hot and rate == hot: item.setBackground(QtCore.Qt.yellow)
+            self.cpu_rate_table.setItem(cpu,1,item)
+        self.cpu_rate_table.setUpdatesEnabled(True)
+
+        irqs = sorted((i for i in cur["irqs"] if i.isdigit()), key=int)
+        self.irq_table.setUpdatesEnabled(False)
+        self.irq_table.setSortingEnabled(False)
+        self.irq_table.setRowCount(len(irqs))
+        for row, irq in enumerate(irqs):
+            self.irq_table.setItem(row,0,QtWidgets.QTableWidgetItem(irq))
+            self.irq_table.setItem(row,1,QtWidgets.QTableWidgetItem(cur["irqs"][irq][1]))
+            self.irq_table.setItem(row,2,QtWidgets.QTableWidgetItem(get_irq_affinity(irq)))
+            self.irq_table.setItem(row,3,QtWidgets.QTableWidgetItem(f"{per_irq.get(irq, 0):.0f}"))
+        self.irq_table.resizeColumnToContents(0)
+        self.irq_table.setUpdatesEnabled(True)
+
+    def hotspot_summary(self):
+        if not self.cpu_rates: return "aucune mesure"
+        cpu = max(range(len(self.cpu_rates)), key=self.cpu_rates.__getitem__)
+        return f"CPU{cpu} = {self.cpu_rates[cpu]:.0f} irq/s (max), total {sum(self.cpu_rates):.0f} irq/s"
+
+    def confirmed_irq_affinity(self, mode, selected):
+        try: cpus = parse_cpu_list(self.irq_cpus.text())
+        except ValueError as e:
+            self.log_affinity.appendPlainText(f"[Erreur] CPUs : {e}"); return
+        if selected:
+            irqs = sorted({self.irq_table.item(i.row(),0).text() for i in self.irq_table.selectedIndexes()}, key=int)
+        else:
+            irqs = [i for i,(_, desc) in self.irq_prev["irqs"].items() if is_device_irq(i, desc)] if self.irq_prev else []
+        descs = self.irq_prev["irqs"] if self.irq_prev else {}
+        managed = [i for i in irqs if i in descs and is_managed_irq(descs[i][1])]
+        irqs = [i for i in irqs if i not in managed]
+        if not irqs and not managed:
+            self.log_affinity.appendPlainText("Aucune IRQ sélectionnée"); return
+        balance = irqbalance_active()
+        warn = "\n\nirqbalance est actif et réécrira ces affinités." if balance else ""
+        if not confirm_action(self, f"Confirmer {'épinglage' if mode == 'pin' else 'répartition'} de {len(irqs)} IRQ sur {format_cpu_list(cpus)} ?{warn}"): return
+
+        if self.log_affinity.toPlainText().strip():
+            self.log_affinity.appendPlainText("-"*40)
+        if balance:
+            self.log_affinity.appendPlainText("[!] irqbalance actif : il réécrit ces affinités en quelques secondes (systemctl stop irqbalance)")
+        if managed:
+            self.log_affinity.appendPlainText(f"IRQ {', '.join(managed)} ignorées : affinité gérée par le noyau")
+        self.log_affinity.appendPlainText(f"Avant : {self.hotspot_summary()}")
+        plan = {irq: cpus for irq in irqs} if mode == "pin" else {irq: [cpu] for irq, cpu in plan_irq_spread(irqs, cpus).items()}
+        # un échec (ex. EIO sur une IRQ gérée non détectée) n'interrompt pas les suivantes
+        for irq, target in plan.items():
+            try:
+                set_irq_affinity(irq, target)
+                self.log_affinity.appendPlainText(f"IRQ {irq} -> CPU {format_cpu_list(target)}")
+            except OSError as e:
+                self.log_affinity.appendPlainText(f"IRQ {irq} : [Erreur] {e}")
+        # Nouvelle base de mesure : le prochain intervalle ne couvre que l'état « après »
+        self.refresh_irq_tab(); self.irq_timer.start()
+        QtCore.QTimer.singleShot(self.irq_timer.interval() + 100,
+            lambda: self.log_affinity.appendPlainText(f"Après : {self.hotspot_summary()}{' (irqbalance actif, mesure non fiable)' if balance else ''}"))
+
     def build_proc_cache(self):
         self.proc_cache.clear()
         self.ppid_cache.clear()
@@ -731,11 +1197,10 @@ class MainWindow(QtWidgets.QMainWindow):
 def main():
     app = QtWidgets.QApplication(sys.argv)
     win = MainWindow()
+    # --startup-time : mesure le premier affichage puis quitte (code 1 si budget dépassé)
+    win.exit_after_paint = "--startup-time" in sys.argv
     win.show()
-    if os.geteuid() != 0: win.statusBar().showMessage("Non root — certaines actions nécessitent sudo")
     sys.exit(app.exec_())
 
 if __name__=="__main__":
-    app = QtWidgets.QApplication(sys.argv)
-    win = MainWindow(); win.show()
-    sys.exit(app.exec_())
+    main()